@@ -1,10 +1,12 @@
 from __future__ import annotations
 
+import os
 from datetime import datetime, date
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.schema import CreateTable
 from sqlalchemy import String, Integer, Date, DateTime, Text, Float
 
 
@@ -43,12 +45,33 @@ class ScraperError(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
 
 
-DB_URL = "sqlite+aiosqlite:///./insiders.db"
+class UpdateRequest(Base):
+    """Запрос от API к воркеру: update — внеочередной парсинг, reset — сброс базы."""
+    __tablename__ = "update_requests"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    kind: Mapped[str] = mapped_column(String, default="update")
+    requested_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class WorkerLock(Base):
+    """Лидер-лок: парсит только тот воркер, чья аренда не истекла."""
+    __tablename__ = "worker_locks"
+
+    name: Mapped[str] = mapped_column(String, primary_key=True)
+    owner: Mapped[str] = mapped_column(String)
+    expires_at: Mapped[datetime] = mapped_column(DateTime)
+
+
+DB_URL = os.getenv("DB_URL", "sqlite+aiosqlite:///./insiders.db")
 
 engine = create_async_engine(DB_URL, echo=False)
 SessionLocal = async_sessionmaker(engine, expire_on_commit=False)
 
 
 async def init_db():
+    # API-воркеры и парсер стартуют одновременно: create_all сначала проверяет,
+    # потом создаёт, и гонка даёт "table already exists". IF NOT EXISTS — атомарно.
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        for table in Base.metadata.sorted_tables:
+            await conn.execute(CreateTable(table, if_not_exists=True))
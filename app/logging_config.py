@@ -1,31 +1,168 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 import os
+import queue
+import threading
+import time
 
 LOG_DIR = "logs"
 os.makedirs(LOG_DIR, exist_ok=True)
 
-def setup_logging():
+# настройки через переменные окружения
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
+# пример: "smartlab=DEBUG,smartlab.skip=WARNING,httpx=WARNING"
+LOG_LEVELS = os.getenv("LOG_LEVELS", "httpx=WARNING")
+LOG_JSON = os.getenv("LOG_JSON", "0").lower() in ("1", "true", "yes")
+# пропускаем в лог только каждую N-ю запись [SKIP] (1 = все)
+LOG_SKIP_SAMPLE = int(os.getenv("LOG_SKIP_SAMPLE", "50"))
+# но не чаще одной записи [SKIP] в N секунд (0 = без ограничения)
+LOG_SKIP_INTERVAL = float(os.getenv("LOG_SKIP_INTERVAL", "60"))
+
+SKIP_LOGGER = "smartlab.skip"
+# uvicorn вешает на эти логгеры свои синхронные StreamHandler'ы
+UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: QueueListener | None = None
+
+
+class TextFormatter(logging.Formatter):
+    """Обычный текстовый формат + счётчик для сэмплированных записей."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        text = super().format(record)
+        seen = getattr(record, "skip_seen", None)
+        if seen is not None:
+            first, sep, rest = text.partition("\n")
+            text = f"{first} (sampled, seen={seen}){sep}{rest}"
+        return text
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна запись лога — одна JSON-строка."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "time": self.formatTime(record, self.datefmt),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        seen = getattr(record, "skip_seen", None)
+        if seen is not None:
+            data["skip_seen"] = seen
+        if record.exc_info:
+            data["exc_info"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            data["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(data, ensure_ascii=False)
+
+
+class LazyQueueHandler(QueueHandler):
+    """
+    Стандартный QueueHandler.prepare() форматирует запись в вызывающем
+    потоке (т.е. в event loop). Очередь у нас внутрипроцессная, pickle
+    не нужен — кладём запись как есть, форматируют обработчики listener'а.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+class SampleFilter(logging.Filter):
+    """
+    Пропускает каждую N-ю запись и не чаще одной за interval секунд.
+    Остальные отбрасываются ещё до постановки в очередь.
+    """
+
+    def __init__(self, every: int = 1, interval: float = 0.0) -> None:
+        super().__init__()
+        self.every = max(every, 1)
+        self.interval = interval
+        self._count = 0
+        self._last = 0.0
+        self._lock = threading.Lock()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        with self._lock:
+            self._count += 1
+            if (self._count - 1) % self.every:
+                return False
+            now = time.monotonic()
+            if self.interval and now - self._last < self.interval:
+                return False
+            self._last = now
+            record.skip_seen = self._count
+            return True
+
+
+def _parse_levels(spec: str) -> dict[str, str]:
+    levels = {}
+    for item in spec.split(","):
+        if "=" not in item:
+            continue
+        name, level = item.split("=", 1)
+        levels[name.strip()] = level.strip().upper()
+    return levels
+
+
+def setup_logging(role: str = "app") -> QueueListener:
+    """
+    role попадает в имя лог-файла вместе с pid: несколько uvicorn-воркеров
+    и парсер не должны ротировать один и тот же файл.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
     logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
+    logger.setLevel(LOG_LEVEL.upper())
 
     # формат
-    formatter = logging.Formatter(
-        "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
-        datefmt="%Y-%m-%d %H:%M:%S"
-    )
+    if LOG_JSON:
+        formatter = JsonFormatter(datefmt="%Y-%m-%dT%H:%M:%S")
+    else:
+        formatter = TextFormatter(
+            "%(asctime)s | %(levelname)s | %(name)s | %(message)s",
+            datefmt="%Y-%m-%d %H:%M:%S"
+        )
 
-    # лог в файл
+    # лог в файл — свой на каждый процесс
     file_handler = RotatingFileHandler(
-        f"{LOG_DIR}/app.log",
+        f"{LOG_DIR}/{role}-{os.getpid()}.log",
         maxBytes=5_000_000,
         backupCount=5,
         encoding="utf-8",
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
 
     # лог в консоль (docker)
     console = logging.StreamHandler()
     console.setFormatter(formatter)
-    logger.addHandler(console)
+
+    # в event loop только кладём запись в очередь,
+    # форматирование и запись на диск — в фоновом потоке
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(LazyQueueHandler(log_queue))
+
+    _listener = QueueListener(
+        log_queue, file_handler, console, respect_handler_level=True
+    )
+    _listener.start()
+    atexit.register(_listener.stop)
+
+    # uvicorn настраивает логирование до импорта приложения — перенаправляем
+    # его логгеры (в т.ч. access log) в общую очередь
+    for name in UVICORN_LOGGERS:
+        uv_logger = logging.getLogger(name)
+        uv_logger.handlers.clear()
+        uv_logger.propagate = True
+
+    for name, level in _parse_levels(LOG_LEVELS).items():
+        logging.getLogger(name).setLevel(level)
+
+    logging.getLogger(SKIP_LOGGER).addFilter(
+        SampleFilter(every=LOG_SKIP_SAMPLE, interval=LOG_SKIP_INTERVAL)
+    )
+    return _listener
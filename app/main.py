@@ -2,18 +2,15 @@ from __future__ import annotations
 
 import json
 from fastapi.responses import JSONResponse
-import httpx
-from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from fastapi import FastAPI
 
 from app.db import init_db, SessionLocal
 from app.models import InsiderDealDTO
-from app.services.db_service import get_buybacks, get_errors, reset_all
-from app.sources.smartlab_news import SmartLabNewsSource
+from app.services.db_service import get_buybacks, get_errors, request_update
 from app.logging_config import setup_logging
 import logging
 
-setup_logging()
+setup_logging("api")
 log = logging.getLogger("main")
 
 
@@ -28,28 +25,12 @@ class PrettyJSONResponse(JSONResponse):
 
 app = FastAPI(title="Insider deals smartlab",default_response_class=PrettyJSONResponse)
 
-news_source = SmartLabNewsSource()
-scheduler = AsyncIOScheduler()
-
-
-async def hourly_update() -> None:
-    async with SessionLocal() as session, httpx.AsyncClient() as client:
-        await news_source.update(client, session)
-
 
 @app.on_event("startup")
 async def on_startup() -> None:
+    # парсингом занимается отдельный процесс: python -m app.worker
     log.info("Starting FastAPI service…")
     await init_db()
-    await hourly_update()
-    scheduler.add_job(hourly_update, "interval", hours=1)
-    scheduler.start()
-    log.info("Scheduler started")
-
-
-@app.on_event("shutdown")
-async def on_shutdown() -> None:
-    scheduler.shutdown(wait=False)
 
 
 @app.get("/health")
@@ -59,8 +40,9 @@ async def health() -> dict:
 
 @app.post("/update")
 async def update_now() -> dict:
-    await hourly_update()
-    return {"status": "ok"}
+    async with SessionLocal() as session:
+        await request_update(session)
+    return {"status": "queued"}
 
 
 @app.get("/buybacks", response_model=list[InsiderDealDTO])
@@ -86,6 +68,7 @@ async def errors():
 
 @app.post("/reset")
 async def reset_db():
+    # сбрасывает воркер, чтобы не удалять данные посреди парсинга
     async with SessionLocal() as session:
-        await reset_all(session)
-    return {"status": "reset"}
\ No newline at end of file
+        await request_update(session, "reset")
+    return {"status": "queued"}
\ No newline at end of file
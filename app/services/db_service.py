@@ -1,9 +1,12 @@
 from __future__ import annotations
 
-from sqlalchemy import select, delete
+from datetime import datetime, timedelta
+
+from sqlalchemy import select, delete, update, func, or_
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db import DealDB, ScrapedArticle, ScraperError
+from app.db import DealDB, ScrapedArticle, ScraperError, UpdateRequest, WorkerLock
 from app.models import InsiderDeal
 
 
@@ -64,3 +67,72 @@ async def reset_all(session: AsyncSession) -> None:
     await session.execute(delete(ScrapedArticle))
     await session.execute(delete(ScraperError))
     await session.commit()
+
+
+async def count_fresh_articles(
+    session: AsyncSession, since: datetime, max_age: timedelta
+) -> int:
+    """
+    Сколько статей загружено (scraped_at) после since. Дата сделки в
+    раскрытии обычно раньше даты публикации, поэтому отсекаем только явный
+    архив — сделки старше max_age до since.
+    """
+    res = await session.execute(
+        select(func.count())
+        .select_from(ScrapedArticle)
+        .outerjoin(DealDB, DealDB.source_url == ScrapedArticle.url)
+        .where(ScrapedArticle.scraped_at >= since)
+        .where(or_(
+            DealDB.deal_date.is_(None),
+            DealDB.deal_date >= (since - max_age).date(),
+        ))
+    )
+    return res.scalar_one()
+
+
+async def request_update(session: AsyncSession, kind: str = "update") -> None:
+    session.add(UpdateRequest(kind=kind))
+    await session.commit()
+
+
+async def pop_update_requests(session: AsyncSession) -> set[str]:
+    res = await session.execute(select(UpdateRequest))
+    rows = res.scalars().all()
+    if not rows:
+        return set()
+    await session.execute(
+        delete(UpdateRequest).where(UpdateRequest.id.in_([r.id for r in rows]))
+    )
+    await session.commit()
+    return {r.kind for r in rows}
+
+
+async def acquire_lock(session: AsyncSession, name: str, owner: str, ttl: timedelta) -> bool:
+    """Берёт или продлевает аренду лока. False — лок держит другой живой воркер."""
+    now = datetime.utcnow()
+    res = await session.execute(
+        update(WorkerLock)
+        .where(WorkerLock.name == name)
+        .where(or_(WorkerLock.owner == owner, WorkerLock.expires_at < now))
+        .values(owner=owner, expires_at=now + ttl)
+    )
+    await session.commit()
+    if res.rowcount:
+        return True
+
+    session.add(WorkerLock(name=name, owner=owner, expires_at=now + ttl))
+    try:
+        await session.commit()
+    except IntegrityError:
+        await session.rollback()
+        return False
+    return True
+
+
+async def release_lock(session: AsyncSession, name: str, owner: str) -> None:
+    await session.execute(
+        delete(WorkerLock)
+        .where(WorkerLock.name == name)
+        .where(WorkerLock.owner == owner)
+    )
+    await session.commit()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, time, timedelta, timezone
+from typing import Optional, Tuple
+
+# Москва живёт в UTC+3 без перехода на летнее время
+MSK = timezone(timedelta(hours=3))
+
+
+def parse_window(spec: str) -> Optional[Tuple[time, time]]:
+    """
+    "09:50-23:50" -> (time(9, 50), time(23, 50)); пустая строка -> None.
+    Окно может переходить через полночь: "19:00-01:00".
+    """
+    if not spec:
+        return None
+    start, end = spec.split("-", 1)
+    window = time.fromisoformat(start.strip()), time.fromisoformat(end.strip())
+    if window[0] == window[1]:
+        raise ValueError(f"Empty trading window: {spec!r}")
+    return window
+
+
+@dataclass
+class AdaptivePolicy:
+    """
+    Подбирает интервал до следующего парсинга:
+    - если за lookback были публикации, целевой интервал — средний
+      промежуток между ними; нашлись новые — половина от него;
+    - публикаций не было: нашлись новые — интервал сокращается вдвое,
+      пусто — растёт в backoff раз;
+    - в торговое окно MOEX (если задано) интервал не больше
+      session_max_interval, на открытии сессии — min_interval;
+    - вне окна — max_interval, но не позже открытия следующей сессии.
+    """
+    min_interval: timedelta = timedelta(minutes=5)
+    max_interval: timedelta = timedelta(hours=2)
+    session_max_interval: timedelta = timedelta(minutes=30)
+    lookback: timedelta = timedelta(hours=6)
+    backoff: float = 2.0
+    trading_window: Optional[Tuple[time, time]] = None
+
+    def in_trading_window(self, now: datetime) -> bool:
+        if self.trading_window is None:
+            return True
+        msk = now.astimezone(MSK)
+        start, end = self.trading_window
+        t = msk.time()
+        if start < end:
+            return msk.weekday() < 5 and start <= t < end
+        # окно через полночь: хвост после 00:00 относится к сессии прошлого дня
+        if t >= start:
+            return msk.weekday() < 5
+        if t < end:
+            return (msk - timedelta(days=1)).weekday() < 5
+        return False
+
+    def next_window_open(self, now: datetime) -> datetime:
+        start, _ = self.trading_window
+        msk = now.astimezone(MSK)
+        day = msk.date()
+        while True:
+            candidate = datetime.combine(day, start, tzinfo=MSK)
+            if candidate > msk and candidate.weekday() < 5:
+                return candidate
+            day += timedelta(days=1)
+
+    def next_interval(
+        self,
+        current: timedelta,
+        new_items: int,
+        recent_items: int,
+        now: datetime,
+    ) -> timedelta:
+        if not self.in_trading_window(now):
+            return min(self.max_interval, self.next_window_open(now) - now)
+
+        cap = self.max_interval
+        if self.trading_window is not None:
+            cap = min(cap, self.session_max_interval)
+            # предыдущий запуск был вне окна — сессия только открылась
+            if not self.in_trading_window(now - current):
+                return self.min_interval
+
+        if recent_items:
+            target = self.lookback / recent_items
+            if new_items:
+                interval = min(target, current) / 2
+            else:
+                interval = min(target, current * self.backoff)
+        elif new_items:
+            interval = current / 2
+        else:
+            interval = current * self.backoff
+
+        return max(self.min_interval, min(cap, interval))
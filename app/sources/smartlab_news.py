@@ -25,6 +25,7 @@ from app.services.db_service import (
 )
 import logging
 log = logging.getLogger("smartlab")
+skip_log = logging.getLogger("smartlab.skip")
 
 COMPANY_TICKER_RE = re.compile(
     r"/company/([A-Z0-9\-_.]+)", re.IGNORECASE
@@ -46,7 +47,7 @@ class SmartLabNewsSource:
     async def update(self, client: httpx.AsyncClient, session) -> None:
         log.info("Starting update for smartlab.news")
         for list_url in self.LIST_PAGES:
-            log.info(f"[LIST] Fetching list page: {list_url}")
+            log.info("[LIST] Fetching list page: %s", list_url)
             try:
                 resp = await client.get(list_url, timeout=20.0)
                 resp.raise_for_status()
@@ -64,14 +65,18 @@ class SmartLabNewsSource:
                     )
                     links.add(full_url)
 
-                log.info(f"[LIST] Found {len(links)} article links")
+                log.info("[LIST] Found %d article links", len(links))
 
+                skipped = 0
                 for url in links:
                     if await is_article_loaded(session, url):
-                        log.info(f"[SKIP] Already loaded: {url}")
+                        skipped += 1
+                        skip_log.info("[SKIP] Already loaded: %s", url)
                         continue
                     await self._parse_article(client, session, url)
 
+                log.info("[LIST] Skipped %d already loaded articles", skipped)
+
                 log.info("Finished update for smartlab.news")
             except Exception as ex:
                 await save_error(session, list_url, self.name, str(ex))
@@ -79,7 +84,7 @@ class SmartLabNewsSource:
     async def _parse_article(
         self, client: httpx.AsyncClient, session, url: str
     ) -> None:
-        log.info(f"[ARTICLE][START] {url}")
+        log.info("[ARTICLE][START] %s", url)
         try:
             resp = await client.get(url, timeout=20.0)
             resp.raise_for_status()
@@ -112,11 +117,11 @@ class SmartLabNewsSource:
             await save_deal(session, deal)
             await mark_article_loaded(session, url)
             log.info(
-            f"[ARTICLE][OK] {url} | issuer={issuer}, "
-            f"type={deal_type}, shares={shares}, date={deal_date}, ticker={ticker}"
-        )
+                "[ARTICLE][OK] %s | issuer=%s, type=%s, shares=%s, date=%s, ticker=%s",
+                url, issuer, deal_type, shares, deal_date, ticker,
+            )
         except Exception as ex:
-            log.error(f"[ARTICLE][FETCH FAIL] {url} — {ex}", exc_info=True)
+            log.error("[ARTICLE][FETCH FAIL] %s — %s", url, ex, exc_info=True)
             await save_error(session, url, self.name, str(ex))
 
     @staticmethod
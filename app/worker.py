@@ -0,0 +1,179 @@
+"""
+Отдельный процесс парсера.
+
+API-процессы (uvicorn с любым числом воркеров) только читают базу,
+а парсит smartlab.news ровно один воркер — тот, кто держит лидер-лок.
+Запуск:  python -m app.worker
+"""
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import logging
+import os
+import signal
+import socket
+from datetime import datetime, timedelta, timezone
+
+import httpx
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+
+from app.db import init_db, SessionLocal
+from app.logging_config import setup_logging
+from app.services.db_service import (
+    acquire_lock,
+    count_fresh_articles,
+    pop_update_requests,
+    release_lock,
+    reset_all,
+)
+from app.services.polling import AdaptivePolicy, parse_window
+from app.sources.smartlab_news import SmartLabNewsSource
+
+log = logging.getLogger("worker")
+
+LOCK_NAME = "scraper"
+LOCK_TTL = timedelta(seconds=int(os.getenv("WORKER_LOCK_TTL", "60")))
+# как часто продлеваем лок и проверяем запросы от /update
+POLL_SECONDS = int(os.getenv("WORKER_POLL_SECONDS", "5"))
+UPDATE_HOURS = int(os.getenv("WORKER_UPDATE_HOURS", "1"))
+# fixed — раз в UPDATE_HOURS, adaptive — по наблюдаемой частоте публикаций
+SCHEDULE_MODE = os.getenv("WORKER_SCHEDULE", "fixed")
+
+policy = AdaptivePolicy(
+    min_interval=timedelta(minutes=int(os.getenv("ADAPTIVE_MIN_MINUTES", "5"))),
+    max_interval=timedelta(minutes=int(os.getenv("ADAPTIVE_MAX_MINUTES", "120"))),
+    session_max_interval=timedelta(
+        minutes=int(os.getenv("ADAPTIVE_SESSION_MAX_MINUTES", "30"))
+    ),
+    lookback=timedelta(hours=int(os.getenv("ADAPTIVE_LOOKBACK_HOURS", "6"))),
+    backoff=float(os.getenv("ADAPTIVE_BACKOFF", "2")),
+    # например "09:50-23:50" — торговые часы MOEX по Москве, пн–пт
+    trading_window=parse_window(os.getenv("ADAPTIVE_TRADING_HOURS", "")),
+)
+interval = timedelta(hours=UPDATE_HOURS)
+# статьи со сделками старше этого считаем догрузкой архива, а не новыми
+ARCHIVE_AGE = timedelta(days=int(os.getenv("ADAPTIVE_ARCHIVE_DAYS", "14")))
+
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+news_source = SmartLabNewsSource()
+scheduler = AsyncIOScheduler()
+stop_event = asyncio.Event()
+scrape_lock = asyncio.Lock()
+
+
+async def hourly_update() -> None:
+    # задача "update" постоянная (interval-триггер), поэтому пропуск здесь
+    # не останавливает расписание — следующий запуск всё равно будет
+    if scrape_lock.locked():
+        log.info("Update already running, skipping")
+        return
+    async with scrape_lock:
+        started = datetime.utcnow()
+        try:
+            async with SessionLocal() as session, httpx.AsyncClient() as client:
+                await news_source.update(client, session)
+        finally:
+            if SCHEDULE_MODE == "adaptive":
+                await schedule_next(started)
+
+
+async def schedule_next(started: datetime) -> None:
+    # переставляем постоянную задачу "update"; если расчёт упал, она
+    # продолжит срабатывать с прежним интервалом
+    global interval
+    try:
+        async with SessionLocal() as session:
+            new_items = await count_fresh_articles(session, started, ARCHIVE_AGE)
+            recent_items = await count_fresh_articles(
+                session, started - policy.lookback, ARCHIVE_AGE
+            )
+        now = datetime.now(timezone.utc)
+        interval = policy.next_interval(interval, new_items, recent_items, now)
+        log.info(
+            "Next update in %s (new=%d, last %s=%d)",
+            interval, new_items, policy.lookback, recent_items,
+        )
+    except Exception:
+        log.exception("Failed to compute next interval, falling back to max")
+        interval = policy.max_interval
+
+    scheduler.reschedule_job(
+        "update", trigger="interval", seconds=interval.total_seconds()
+    )
+
+
+async def poll() -> None:
+    async with SessionLocal() as session:
+        if not await acquire_lock(session, LOCK_NAME, WORKER_ID, LOCK_TTL):
+            log.error("Leader lock lost, stopping worker %s", WORKER_ID)
+            stop_event.set()
+            return
+        # пока идёт парсинг, запросы остаются в очереди до следующего poll:
+        # текущий проход мог скачать список статей раньше, чем пришёл запрос
+        if scrape_lock.locked():
+            return
+        requested = await pop_update_requests(session)
+
+        if "reset" in requested:
+            log.info("Got reset request from API")
+            async with scrape_lock:
+                await reset_all(session)
+
+    if "update" in requested:
+        log.info("Got update request from API")
+        scheduler.add_job(hourly_update, misfire_grace_time=None)
+
+
+async def wait_for_leadership() -> None:
+    while not stop_event.is_set():
+        async with SessionLocal() as session:
+            if await acquire_lock(session, LOCK_NAME, WORKER_ID, LOCK_TTL):
+                log.info("Worker %s acquired leader lock", WORKER_ID)
+                return
+        log.info("Leader lock is held by another worker, waiting…")
+        with contextlib.suppress(asyncio.TimeoutError):
+            await asyncio.wait_for(stop_event.wait(), timeout=POLL_SECONDS)
+
+
+async def run() -> None:
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        # на Windows add_signal_handler не поддерживается — там остаётся Ctrl+C
+        with contextlib.suppress(NotImplementedError):
+            loop.add_signal_handler(sig, stop_event.set)
+
+    log.info("Starting scraper worker %s", WORKER_ID)
+    await init_db()
+    await wait_for_leadership()
+    if stop_event.is_set():
+        return
+
+    try:
+        scheduler.add_job(hourly_update, misfire_grace_time=None)
+        # одна постоянная задача; в adaptive-режиме schedule_next
+        # только меняет её интервал, сама задача никогда не пропадает
+        scheduler.add_job(
+            hourly_update, "interval", hours=UPDATE_HOURS, id="update",
+            misfire_grace_time=None, coalesce=True,
+        )
+        scheduler.add_job(poll, "interval", seconds=POLL_SECONDS)
+        scheduler.start()
+        log.info("Scheduler started")
+        await stop_event.wait()
+    finally:
+        scheduler.shutdown(wait=False)
+        async with SessionLocal() as session:
+            await release_lock(session, LOCK_NAME, WORKER_ID)
+        log.info("Worker %s stopped", WORKER_ID)
+
+
+def main() -> None:
+    setup_logging("worker")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta, timezone
+
+import pytest
+
+from app.services.polling import AdaptivePolicy, parse_window
+
+# понедельник, 09:50 МСК — открытие сессии
+MONDAY_OPEN = datetime(2026, 10, 19, 6, 50, tzinfo=timezone.utc)
+
+
+def make_policy(**kwargs) -> AdaptivePolicy:
+    return AdaptivePolicy(trading_window=parse_window("09:50-23:50"), **kwargs)
+
+
+def run_day(policy: AdaptivePolicy, start: datetime, until: datetime, recent_items: int = 0):
+    intervals = []
+    now, current = start, timedelta(hours=2)
+    while now < until:
+        current = policy.next_interval(current, 0, recent_items, now)
+        intervals.append(current)
+        now += current
+    return intervals
+
+
+def test_session_open_resets_to_min_interval():
+    policy = make_policy()
+    # прошлый запуск был ночью, 2 часа назад
+    assert policy.next_interval(timedelta(hours=2), 0, 0, MONDAY_OPEN) == policy.min_interval
+
+
+def test_quiet_session_never_exceeds_session_max():
+    policy = make_policy()
+    intervals = run_day(policy, MONDAY_OPEN, MONDAY_OPEN + timedelta(hours=14))
+    assert intervals[0] == policy.min_interval
+    assert max(intervals) == policy.session_max_interval
+    # чаще, чем старый фиксированный раз в час
+    assert len(intervals) > 14
+
+
+def test_observed_rate_sets_target_interval():
+    policy = make_policy(lookback=timedelta(hours=6))
+    now = MONDAY_OPEN + timedelta(hours=3)
+    # 36 публикаций за 6 часов — в среднем раз в 10 минут
+    assert policy.next_interval(timedelta(minutes=20), 0, 36, now) == timedelta(minutes=10)
+    assert policy.next_interval(timedelta(minutes=20), 2, 36, now) == policy.min_interval
+
+
+def test_new_items_halve_and_empty_runs_back_off():
+    policy = AdaptivePolicy()
+    now = MONDAY_OPEN
+    assert policy.next_interval(timedelta(minutes=40), 1, 0, now) == timedelta(minutes=20)
+    assert policy.next_interval(timedelta(minutes=40), 0, 0, now) == timedelta(minutes=80)
+    assert policy.next_interval(timedelta(hours=2), 0, 0, now) == policy.max_interval
+
+
+def test_off_hours_wait_until_session_open():
+    policy = make_policy()
+    saturday = datetime(2026, 10, 17, 9, 0, tzinfo=timezone.utc)
+    assert policy.next_interval(timedelta(minutes=5), 0, 0, saturday) == policy.max_interval
+    before_open = MONDAY_OPEN - timedelta(minutes=20)
+    assert policy.next_interval(timedelta(hours=2), 0, 0, before_open) == timedelta(minutes=20)
+
+
+def test_overnight_window():
+    policy = AdaptivePolicy(trading_window=parse_window("19:00-01:00"))
+    # вторник 00:30 МСК — хвост понедельничной сессии
+    assert policy.in_trading_window(datetime(2026, 10, 19, 21, 30, tzinfo=timezone.utc))
+    # воскресенье 00:30 МСК — хвост субботы, торгов нет
+    assert not policy.in_trading_window(datetime(2026, 10, 17, 21, 30, tzinfo=timezone.utc))
+
+
+def test_parse_window():
+    assert parse_window("") is None
+    assert parse_window("09:50-23:50") == (time(9, 50), time(23, 50))
+    with pytest.raises(ValueError):
+        parse_window("10:00-10:00")